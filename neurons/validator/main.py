@@ -21,6 +21,7 @@ from nuance.database import (
 import nuance.models as models
 from nuance.constitution import constitution_store
 from nuance.processing import ProcessingResult, PipelineFactory
+from nuance.processing.llm import LLMService
 from nuance.social import SocialContentProvider
 from nuance.utils.logging import logger
 from nuance.utils.bittensor_utils import (
@@ -688,4 +689,7 @@ if __name__ == "__main__":
     validator = NuanceValidator()
     loop = asyncio.get_event_loop()
     loop.run_until_complete(validator.initialize())
-    loop.run_forever()
+    try:
+        loop.run_forever()
+    finally:
+        loop.run_until_complete(LLMService.shutdown())
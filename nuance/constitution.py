@@ -170,6 +170,27 @@ class ConstitutionStore:
             logger.error(f"❌ Error getting topic weights: {traceback.format_exc()}")
             return {}
         
+    async def get_topic_keywords(self) -> dict[str, list[str]]:
+        """Get optional per-topic keyword lists for cheap lexical prefiltering"""
+        try:
+            config = await self.get_constitution_config()
+
+            if not config or "topics" not in config:
+                logger.warning("⚠️ No topics found in config")
+                return {}
+
+            topic_keywords = {}
+            for topic_name, topic_config in config["topics"].items():
+                keywords = topic_config.get("keywords")
+                if keywords:
+                    topic_keywords[topic_name] = [keyword.lower() for keyword in keywords]
+
+            return topic_keywords
+
+        except Exception:
+            logger.error(f"❌ Error getting topic keywords: {traceback.format_exc()}")
+            return {}
+
     async def get_verified_users(
         self, platform: str = "twitter", category: Optional[str] = None
     ) -> list[dict[str, Any]]:
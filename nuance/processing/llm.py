@@ -3,13 +3,17 @@ import asyncio
 import re
 from typing import ClassVar, Optional
 
-import aiohttp
+import httpx
+import orjson
 from loguru import logger
 
+from nuance.processing.llm_cache import AsyncTTLCache, SemanticLLMCache, make_cache_key
 from nuance.utils.bittensor_utils import get_wallet
-from nuance.utils.networking import async_http_request_with_retry
+from nuance.utils.networking import async_httpx_request_with_retry
 from nuance.settings import settings
 
+_THINK_RE = re.compile(r"<think>.*?</think>", re.DOTALL)
+
 
 class LLMService:
     """
@@ -26,7 +30,13 @@ class LLMService:
     @classmethod
     async def get_instance(cls, *args, **kwargs) -> "LLMService":
         """Get or create the singleton instance asynchronously."""
+        # Fast path: once the instance exists, skip the lock entirely so
+        # concurrent callers don't serialize through it
+        if cls._instance is not None:
+            return cls._instance
+
         async with cls._lock:
+            # Double-check after acquiring lock
             if cls._instance is None:
                 instance = super().__new__(cls)
                 await instance._initialize(*args, **kwargs)
@@ -36,8 +46,51 @@ class LLMService:
     async def _initialize(self, model_name: Optional[str] = None):
         """Initialize the LLM service."""
         self.model_name = model_name or "Qwen/Qwen3-8B"
+        # Shared client so every call reuses pooled keep-alive connections
+        # instead of paying a TCP+TLS handshake per request. HTTP/2 lets
+        # concurrent requests multiplex over a single connection.
+        self._http = httpx.AsyncClient(
+            http2=True,
+            timeout=60.0,
+            limits=httpx.Limits(
+                max_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+        )
+        # Exact-match cache for deterministic (temperature=0.0) calls
+        self._cache = AsyncTTLCache(
+            max_size=settings.LLM_CACHE_MAX_SIZE, ttl=settings.LLM_CACHE_TTL
+        )
+        # Optional embedding-similarity cache for near-duplicate prompts
+        self._semantic_cache = None
+        if settings.LLM_SEMANTIC_CACHE_ENABLED:
+            semantic_cache = SemanticLLMCache(
+                model_name=settings.LLM_SEMANTIC_CACHE_MODEL,
+                threshold=settings.LLM_SEMANTIC_CACHE_THRESHOLD,
+                ttl=settings.LLM_SEMANTIC_CACHE_TTL,
+            )
+            if semantic_cache.available:
+                self._semantic_cache = semantic_cache
+        # In-flight deterministic requests, keyed like the exact-match cache,
+        # so concurrent identical calls coalesce into one HTTP request
+        self._inflight: dict[str, asyncio.Future] = {}
         logger.info(f"LLM Service initialized with model: {self.model_name}")
 
+    async def aclose(self):
+        """Close the shared HTTP client."""
+        if self._http and not self._http.is_closed:
+            await self._http.aclose()
+
+    @classmethod
+    async def shutdown(cls):
+        """Close the singleton's resources if it was ever created."""
+        global _service
+        async with cls._lock:
+            if cls._instance is not None:
+                await cls._instance.aclose()
+                cls._instance = None
+            _service = None
+
     async def query(
         self,
         prompt: str,
@@ -45,6 +98,8 @@ class LLMService:
         max_tokens: int = 1024,
         temperature: float = 0.0,
         top_p: float = 0.5,
+        system_prompt: Optional[str] = None,
+        stop: Optional[list[str]] = None,
         keypair=None,
     ) -> str:
         """
@@ -56,20 +111,95 @@ class LLMService:
             max_tokens: Maximum tokens to generate
             temperature: Temperature parameter (0.0-1.0)
             top_p: Top-p sampling parameter
+            system_prompt: Optional static instructions sent as a system
+                message. Keeping this byte-identical across calls lets
+                backends reuse the prefill via server-side prefix caching.
+            stop: Optional list of sequences where generation stops
             keypair: Optional keypair for authentication
 
         Returns:
             Generated response text
         """
-        # Use the provided model function
-        return await self._call_model(
-            prompt=prompt,
-            model=model or self.model_name,
-            max_tokens=max_tokens,
-            temperature=temperature,
-            top_p=top_p,
-            keypair=keypair,
-        )
+        model = model or self.model_name
+
+        # Deterministic calls always produce the same output for the same
+        # inputs, so serve them from the cache when possible.
+        cacheable = settings.LLM_CACHE_ENABLED and temperature == 0.0
+        if cacheable:
+            cache_key = make_cache_key(
+                model, prompt, max_tokens, temperature, top_p, system_prompt, stop
+            )
+            cached_response = await self._cache.get(cache_key)
+            if cached_response is not None:
+                logger.debug("✅ LLM response served from cache")
+                return cached_response
+
+            # An identical request may already be in flight: await its result
+            # instead of firing a duplicate HTTP call
+            inflight = self._inflight.get(cache_key)
+            if inflight is not None:
+                logger.debug("✅ Awaiting identical in-flight LLM request")
+                return await inflight
+
+        # Fall back to the semantic cache, which can hit on near-duplicate prompts
+        semantic_cacheable = self._semantic_cache is not None and temperature == 0.0
+        semantic_text = prompt if system_prompt is None else f"{system_prompt}\n{prompt}"
+        if semantic_cacheable:
+            cached_response = await self._semantic_cache.get(model, semantic_text)
+            if cached_response is not None:
+                logger.debug("✅ LLM response served from semantic cache")
+                return cached_response
+
+            # The semantic lookup suspends (the embedding runs in a thread),
+            # so an identical call may have registered itself meanwhile:
+            # re-check before dispatching a duplicate. No await between this
+            # check and the registration below, so the pair is atomic.
+            if cacheable:
+                inflight = self._inflight.get(cache_key)
+                if inflight is not None:
+                    logger.debug("✅ Awaiting identical in-flight LLM request")
+                    return await inflight
+
+        # Register the in-flight future before dispatching so concurrent
+        # identical calls can attach to it
+        if cacheable:
+            inflight_future = asyncio.get_event_loop().create_future()
+            self._inflight[cache_key] = inflight_future
+
+        try:
+            # Use the provided model function
+            llm_response = await self._call_model(
+                prompt=prompt,
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                top_p=top_p,
+                system_prompt=system_prompt,
+                stop=stop,
+                keypair=keypair,
+            )
+            if cacheable:
+                await self._cache.set(cache_key, llm_response)
+                inflight_future.set_result(llm_response)
+        except Exception as e:
+            if cacheable:
+                inflight_future.set_exception(e)
+                # Mark retrieved in case no other caller is awaiting
+                inflight_future.exception()
+            raise
+        finally:
+            if cacheable:
+                self._inflight.pop(cache_key, None)
+                # If the leader was cancelled (CancelledError bypasses the
+                # except clause above), release the waiters instead of
+                # leaving them awaiting a future that never resolves
+                if not inflight_future.done():
+                    inflight_future.cancel()
+
+        if semantic_cacheable:
+            await self._semantic_cache.set(model, semantic_text, llm_response)
+
+        return llm_response
 
     async def _call_model(
         self,
@@ -78,36 +208,60 @@ class LLMService:
         max_tokens: int,
         temperature: float,
         top_p: float,
+        system_prompt: Optional[str] = None,
+        stop: Optional[list[str]] = None,
         keypair=None
     ) -> str:
         """
         Call the LLM API.
         """
         url = "https://llm.chutes.ai/v1/chat/completions"
-        
+
         headers = {
             "Authorization": f"Bearer {settings.CHUTES_API_KEY}",
             "Content-Type": "application/json",
         }
 
+        # Static system message first, dynamic user message last, so the
+        # backend can serve repeat system prompts from its prefix cache.
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
         payload = {
             "model": model,
-            "messages": [{"role": "user", "content": prompt}],
+            "messages": messages,
             "stream": False,
             "max_tokens": max_tokens,
             "temperature": temperature,
             "top_p": top_p,
         }
-        async with aiohttp.ClientSession() as session:
-            data = await async_http_request_with_retry(
-                session, "POST", url, headers=headers, json=payload
-            )
-            logger.debug(f"🔍 Payload sent to LLM model: {payload}")
-            logger.debug(f"🔍 Received response from LLM model: {data}")
-            logger.info("✅ Received response from LLM model.")
-            llm_response = data["choices"][0]["message"]["content"]
-            logger.debug(f"🔍 LLM response: {llm_response}")
-            return llm_response
+        if stop:
+            payload["stop"] = stop
+        if model.startswith("Qwen/Qwen3"):
+            # Qwen3 emits <think>...</think> blocks by default; we only strip
+            # them afterwards, so skip generating them at all (decode time and
+            # token cost scale with output length). strip_thinking stays as a
+            # defensive no-op for backends that ignore this kwarg.
+            payload["chat_template_kwargs"] = {"enable_thinking": False}
+        # Serialize once with orjson instead of per-request stdlib json
+        data = await async_httpx_request_with_retry(
+            self._http, "POST", url, headers=headers, content=orjson.dumps(payload)
+        )
+        # Lazy formatting: the payload and response can be many KB, so only
+        # stringify them when a sink actually accepts DEBUG
+        logger.opt(lazy=True).debug("🔍 Payload sent to LLM model: {}", lambda: payload)
+        logger.opt(lazy=True).debug("🔍 Received response from LLM model: {}", lambda: data)
+        logger.info("✅ Received response from LLM model.")
+        llm_response = data["choices"][0]["message"]["content"]
+        logger.opt(lazy=True).debug("🔍 LLM response: {}", lambda: llm_response)
+        return llm_response
+
+
+# Module-level reference so query_llm skips the classmethod hop after the
+# first call
+_service: Optional[LLMService] = None
 
 
 # Convenience function for global access
@@ -117,19 +271,25 @@ async def query_llm(
     max_tokens: int = 1024,
     temperature: float = 0.0,
     top_p: float = 0.5,
+    system_prompt: Optional[str] = None,
+    stop: Optional[list[str]] = None,
     keypair=None  # Optional keypair parameter
 ) -> str:
     # Get wallet if not provided
     if not keypair:
         keypair = (await get_wallet()).hotkey
-    
-    service = await LLMService.get_instance()
-    return await service.query(
+
+    global _service
+    if _service is None:
+        _service = await LLMService.get_instance()
+    return await _service.query(
         prompt=prompt,
         model=model,
         max_tokens=max_tokens,
         temperature=temperature,
         top_p=top_p,
+        system_prompt=system_prompt,
+        stop=stop,
         keypair=keypair
     )
 
@@ -138,7 +298,9 @@ def strip_thinking(text: str) -> str:
     """
     Removes <think>...</think> sections from model output.
     """
-    return re.sub(r"<think>.*?</think>", "", text, flags=re.DOTALL).strip()
+    if "<think>" not in text:
+        return text.strip()
+    return _THINK_RE.sub("", text).strip()
     
 if __name__ == "__main__":
     print(asyncio.run(query_llm("Hello, world!")))
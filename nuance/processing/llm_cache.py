@@ -0,0 +1,213 @@
+# nuance/processing/llm_cache.py
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from nuance.utils.logging import logger
+
+try:
+    import faiss
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+
+    SEMANTIC_CACHE_AVAILABLE = True
+except ImportError:
+    SEMANTIC_CACHE_AVAILABLE = False
+
+
+def make_cache_key(
+    model: str,
+    prompt: str,
+    max_tokens: int,
+    temperature: float,
+    top_p: float,
+    system_prompt: Optional[str] = None,
+    stop: Optional[list[str]] = None,
+) -> str:
+    """Build a deterministic key from the inputs that define an LLM call."""
+    return hashlib.sha256(
+        json.dumps(
+            {
+                "m": model,
+                "p": prompt,
+                "sp": system_prompt,
+                "t": temperature,
+                "tp": top_p,
+                "mt": max_tokens,
+                "s": stop,
+            },
+            sort_keys=True,
+        ).encode()
+    ).hexdigest()
+
+
+class AsyncTTLCache:
+    """
+    In-process LRU cache with per-entry TTL, safe to share between coroutines.
+    Used for deterministic (temperature=0.0) LLM responses, where identical
+    inputs always produce the same output.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 3600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    async def get(self, key: str) -> Optional[str]:
+        async with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if time.monotonic() > expires_at:
+                del self._entries[key]
+                return None
+
+            # Refresh LRU order on hit
+            self._entries.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: str) -> None:
+        async with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    async def clear(self) -> None:
+        async with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SemanticLLMCache:
+    """
+    Embedding-similarity cache for LLM prompts. Hits when a new prompt is
+    within `threshold` cosine similarity of an already answered prompt for
+    the same model, so near-duplicate prompts (e.g. paraphrased tweets run
+    through the same topic rubric) skip the LLM call entirely.
+
+    Embeddings are computed locally with a small sentence-transformers
+    model, keeping the cache-check cost far below a full generation.
+    Requires the optional `semantic-cache` dependencies (faiss-cpu,
+    sentence-transformers); `available` is False when they are missing.
+    """
+
+    # How many neighbors to scan past expired/other-model rows, how many
+    # inserts between compaction passes, and how many miss-path embeddings
+    # to keep around for reuse by the following set()
+    _SEARCH_K = 8
+    _COMPACT_EVERY = 64
+    _MAX_PENDING_EMBEDDINGS = 256
+
+    def __init__(
+        self,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        threshold: float = 0.92,
+        ttl: float = 3600,
+    ):
+        self.model_name = model_name
+        self.threshold = threshold
+        self.ttl = ttl
+        self.available = SEMANTIC_CACHE_AVAILABLE
+        if not self.available:
+            logger.warning(
+                "⚠️ Semantic LLM cache requires the optional faiss-cpu and "
+                "sentence-transformers dependencies, cache disabled"
+            )
+
+        self._encoder = None
+        self._index = None
+        self._dim = None
+        # Entries parallel to the index rows: (model, response, expires_at, embedding)
+        self._entries: list[tuple[str, str, float, "np.ndarray"]] = []
+        self._lock = asyncio.Lock()
+        self._load_lock = threading.Lock()
+        # Embeddings computed on a get() miss, reused by the following set()
+        # so a miss doesn't pay for the same encode twice
+        self._pending_embeddings: OrderedDict[tuple[str, str], "np.ndarray"] = OrderedDict()
+        self._inserts_since_compact = 0
+
+    def _ensure_encoder(self) -> None:
+        """Lazily load the embedding model and similarity index."""
+        with self._load_lock:
+            if self._encoder is None:
+                encoder = SentenceTransformer(self.model_name)
+                self._dim = encoder.get_sentence_embedding_dimension()
+                self._index = faiss.IndexHNSWFlat(self._dim, 32, faiss.METRIC_INNER_PRODUCT)
+                self._encoder = encoder
+
+    def _embed(self, text: str) -> "np.ndarray":
+        self._ensure_encoder()
+        # Normalized embeddings make inner product equal cosine similarity
+        embedding = self._encoder.encode([text], normalize_embeddings=True)
+        return np.asarray(embedding, dtype="float32")
+
+    async def get(self, model: str, prompt: str) -> Optional[str]:
+        if not self.available:
+            return None
+
+        # Encode outside the lock: inference is the expensive part and must
+        # not serialize every cache user
+        embedding = await asyncio.to_thread(self._embed, prompt)
+
+        async with self._lock:
+            self._pending_embeddings[(model, prompt)] = embedding
+            while len(self._pending_embeddings) > self._MAX_PENDING_EMBEDDINGS:
+                self._pending_embeddings.popitem(last=False)
+
+            if self._index.ntotal == 0:
+                return None
+
+            # Scan a few neighbors so an expired or other-model row doesn't
+            # shadow a valid one
+            k = min(self._SEARCH_K, self._index.ntotal)
+            similarities, indices = self._index.search(embedding, k)
+            now = time.monotonic()
+            for similarity, index in zip(similarities[0], indices[0]):
+                # Results are ordered by similarity, so stop at the threshold
+                if index < 0 or similarity < self.threshold:
+                    break
+                entry_model, response, expires_at, _ = self._entries[index]
+                if entry_model == model and now <= expires_at:
+                    logger.debug(f"✅ Semantic cache hit (similarity: {float(similarity):.3f})")
+                    return response
+            return None
+
+    async def set(self, model: str, prompt: str, response: str) -> None:
+        if not self.available:
+            return
+
+        async with self._lock:
+            embedding = self._pending_embeddings.pop((model, prompt), None)
+        if embedding is None:
+            embedding = await asyncio.to_thread(self._embed, prompt)
+
+        async with self._lock:
+            self._index.add(embedding)
+            self._entries.append((model, response, time.monotonic() + self.ttl, embedding))
+            self._inserts_since_compact += 1
+            if self._inserts_since_compact >= self._COMPACT_EVERY:
+                self._inserts_since_compact = 0
+                self._compact()
+
+    def _compact(self) -> None:
+        """Drop expired entries and rebuild the index. Called under the lock."""
+        now = time.monotonic()
+        valid_entries = [entry for entry in self._entries if entry[2] > now]
+        if len(valid_entries) == len(self._entries):
+            return
+
+        self._entries = valid_entries
+        self._index = faiss.IndexHNSWFlat(self._dim, 32, faiss.METRIC_INNER_PRODUCT)
+        if valid_entries:
+            self._index.add(np.vstack([entry[3] for entry in valid_entries]))
+        logger.debug(f"🧹 Semantic cache compacted to {len(valid_entries)} entries")
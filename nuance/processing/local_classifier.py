@@ -0,0 +1,84 @@
+# nuance/processing/local_classifier.py
+import asyncio
+
+from nuance.utils.logging import logger
+
+try:
+    import numpy as np
+    import onnxruntime
+    from transformers import AutoTokenizer
+
+    LOCAL_CLASSIFIER_AVAILABLE = True
+except ImportError:
+    LOCAL_CLASSIFIER_AVAILABLE = False
+
+
+class LocalTopicClassifier:
+    """
+    Small local (quantized) binary classifier used as the first tier of the
+    topic-tagging cascade: high-confidence predictions are served locally
+    without any network round trip, low-confidence ones escalate to the
+    remote LLM.
+
+    Expects a directory containing an ONNX sequence-classification model
+    (model.onnx) with two output logits (not relevant / relevant) and its
+    tokenizer, e.g. an int8-quantized MiniLM cross-encoder fine-tuned on
+    labeled (tweet, topic rubric, is_relevant) examples. Requires the
+    optional `local-classifier` dependencies; `available` is False when
+    they are missing.
+    """
+
+    def __init__(self, model_path: str, confidence_threshold: float = 0.85):
+        self.model_path = model_path
+        self.confidence_threshold = confidence_threshold
+        self.available = LOCAL_CLASSIFIER_AVAILABLE and bool(model_path)
+        if model_path and not LOCAL_CLASSIFIER_AVAILABLE:
+            logger.warning(
+                "⚠️ Local topic classifier requires the optional onnxruntime and "
+                "transformers dependencies, classifier disabled"
+            )
+
+        self._tokenizer = None
+        self._session = None
+        self._lock = asyncio.Lock()
+
+    def _load(self) -> None:
+        """Lazily load the tokenizer and ONNX session."""
+        if self._session is None:
+            self._tokenizer = AutoTokenizer.from_pretrained(self.model_path)
+            self._session = onnxruntime.InferenceSession(f"{self.model_path}/model.onnx")
+
+    def _predict_sync(self, content: str, topic_rubric: str) -> tuple[bool, float]:
+        self._load()
+        encoded = self._tokenizer(
+            topic_rubric,
+            content,
+            truncation=True,
+            max_length=512,
+            return_tensors="np",
+        )
+        input_names = {session_input.name for session_input in self._session.get_inputs()}
+        feeds = {name: value for name, value in encoded.items() if name in input_names}
+
+        logits = self._session.run(None, feeds)[0][0]
+        exps = np.exp(logits - np.max(logits))
+        probabilities = exps / exps.sum()
+        predicted = int(np.argmax(probabilities))
+        return predicted == 1, float(probabilities[predicted])
+
+    async def predict(self, content: str, topic_rubric: str) -> tuple[bool, float]:
+        """
+        Predict whether the content is relevant to the topic.
+
+        Args:
+            content: The post content
+            topic_rubric: The topic's criterion text (template without the tweet)
+
+        Returns:
+            (is_relevant, confidence) tuple
+        """
+        if not self.available:
+            raise RuntimeError("Local topic classifier is not available")
+
+        async with self._lock:
+            return await asyncio.to_thread(self._predict_sync, content, topic_rubric)
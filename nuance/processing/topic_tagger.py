@@ -1,11 +1,74 @@
+import asyncio
+import hashlib
+import json
+import re
+import time
+
 import nuance.constants as cst
 import nuance.models as models
 from nuance.utils.logging import logger
 from nuance.processing.base import Processor, ProcessingResult
 from nuance.processing.llm import query_llm, strip_thinking
+from nuance.processing.local_classifier import LocalTopicClassifier
 from nuance.constitution import constitution_store
+from nuance.settings import settings
 from nuance.social.discovery.twitter import TwitterDiscoveryStrategy
 
+# Fallback extractor for the first {...} block when the model wraps its JSON
+# answer in extra text.
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+# Same for the first [...] block in batched (multi-post) responses.
+_JSON_ARRAY_RE = re.compile(r"\[.*\]", re.DOTALL)
+# Leading true/false of a classifier answer, tolerating case and trailing
+# punctuation (e.g. "True.", "TRUE\n") so tightly capped responses still parse.
+_BOOL_RE = re.compile(r"\s*\"?(true|false)\b", re.IGNORECASE)
+
+# Rough per-prompt character budget for multi-post batching (~4 chars/token),
+# keeping batched prompts well inside the model context.
+_BATCH_PROMPT_CHAR_BUDGET = 24000
+
+# How long fetched topic prompts are reused before asking the constitution
+# store again, keeping the store call out of the per-post hot path.
+_TOPIC_PROMPTS_TTL = 60  # seconds
+
+
+def _coerce_bool(value) -> bool:
+    """
+    Coerce a JSON answer to a boolean, tolerating the "true"/"false" strings
+    and 0/1 integers some models emit. Raises ValueError on anything else so
+    callers fall back instead of silently misclassifying.
+    """
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str) and value.strip().lower() in ("true", "false"):
+        return value.strip().lower() == "true"
+    raise ValueError(f"Expected a boolean in LLM response, got {value!r}")
+
+
+def _parse_bool_response(llm_response: str) -> bool:
+    """Read the leading true/false of a classifier answer."""
+    match = _BOOL_RE.match(llm_response)
+    return bool(match) and match.group(1).lower() == "true"
+
+
+def _split_tweet_template(template: str) -> tuple[str, str] | None:
+    """
+    Split a prompt template around its single {tweet_text} placeholder.
+    Returns None when the placeholder is missing or appears more than once,
+    or when the template contains any other braces (placeholders or {{ }}
+    escapes) that need str.format's processing — concatenation would skip
+    the unescaping and silently change the prompt bytes.
+    """
+    parts = template.split("{tweet_text}")
+    if len(parts) != 2:
+        return None
+    prefix, suffix = parts
+    if "{" in prefix or "}" in prefix or "{" in suffix or "}" in suffix:
+        return None
+    return prefix, suffix
+
 
 class TopicTagger(Processor):
     """Tags content with relevant topics using LLM."""
@@ -16,6 +79,32 @@ class TopicTagger(Processor):
         super().__init__()
         # Initialize Twitter discovery strategy once
         self._twitter_discovery = TwitterDiscoveryStrategy()
+        # Bound concurrent LLM calls to respect provider rate limits
+        self._llm_semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENT_REQUESTS)
+        # Hashes of the static prompt prefixes, to log when a prefix changes
+        # (a changed prefix invalidates server-side prefix caches)
+        self._static_prefix_hashes: dict[str, str] = {}
+        # Short-lived topic prompt cache so processing a post doesn't await
+        # the constitution store every time
+        self._prompts_cache: dict[str, str] | None = None
+        self._prompts_expiry = 0.0
+        # Optional per-topic keywords for the lexical prefilter, refreshed
+        # together with the prompts
+        self._topic_keywords: dict[str, list[str]] = {}
+        # Templates pre-split around {tweet_text} (None when the placeholder
+        # is absent or repeated), so building a prompt is two concats instead
+        # of a str.format parse per call
+        self._compiled: dict[str, tuple[str, str] | None] = {}
+        # Optional local first tier of the classification cascade: serve
+        # high-confidence topic decisions locally, escalate the rest
+        self._local_classifier = None
+        if settings.LOCAL_TOPIC_CLASSIFIER_MODEL_PATH:
+            local_classifier = LocalTopicClassifier(
+                model_path=settings.LOCAL_TOPIC_CLASSIFIER_MODEL_PATH,
+                confidence_threshold=settings.LOCAL_TOPIC_CLASSIFIER_CONFIDENCE_THRESHOLD,
+            )
+            if local_classifier.available:
+                self._local_classifier = local_classifier
     
     async def process(self, input_data: models.Post) -> ProcessingResult[models.Post]:
         """
@@ -27,55 +116,28 @@ class TopicTagger(Processor):
         Returns:
             Processing result with identified topics
         """
+        quote_task = None
         try:
             post = input_data
             post_id = post.post_id
             content = post.content
-            
+
+            # Start fetching the quoted post (if any) now, so the Twitter API
+            # round trip overlaps with the topic LLM calls below
+            quote_task = self._start_quote_fetch(post)
+
             # Get the topic prompts
-            topic_prompts = await constitution_store.get_topic_prompts()
-            
-            # Initialize topics list
-            identified_topics = []
-            
+            topic_prompts = await self._get_prompts()
+
             # Check each topic
             # Topics without a prompt or not in the constitution config is implicitly skipped
-            for topic, topic_ptompt in topic_prompts.items():
-                # Use the topic-specific prompt template
-                prompt_about = topic_ptompt.format(tweet_text=content)
-                
-                # Call LLM to evaluate topic relevance
-                llm_response = strip_thinking(await query_llm(prompt=prompt_about, temperature=0.0))
-                
-                # Check if the post is related to this topic
-                is_relevant = llm_response.strip().lower() == "true"
-                
-                if is_relevant:
-                    logger.info(f"✅ Post {post_id} is about {topic}")
-                    identified_topics.append(topic)
-                else:
-                    logger.debug(f"🚫 Post {post_id} is not about {topic}")
+            identified_topics = await self._classify_topics(post_id, content, topic_prompts)
 
             # Special handling for "nuance_sharing" topic
             # This post QRT a post from Nuance subnet 's X account
-            if post.platform_type == models.PlatformType.TWITTER:
-                try:
-                    is_quote_tweet = post.extra_data.get("is_quote_tweet", False)
-                    if is_quote_tweet:
-                        quoted_status_id = post.extra_data.get("quoted_status_id")
-                        if quoted_status_id:
-                            logger.debug(f"🔍 Post {post_id} is quote tweet, quoted_status_id: {quoted_status_id}")
-
-                            # Fetch the quoted post to check if it's from Nuance account
-                            quoted_post = await self._twitter_discovery.get_post(quoted_status_id)
-
-                            if quoted_post.account_id == cst.NUANCE_SOCIAL_ACCOUNT_ID:
-                                identified_topics.append("nuance_sharing")
-                                logger.info(f"✅ Post {post_id} tagged with 'nuance_sharing' - quotes Nuance account post {quoted_status_id}")
-                                
-                except Exception as e:
-                    logger.warning(f"⚠️ Error checking nuance_sharing for post {post_id}: {str(e)}")
-            
+            if await self._check_nuance_sharing(post, quote_task):
+                identified_topics.append("nuance_sharing")
+
             # Update data with identified topics
             post.topics = identified_topics
             
@@ -87,12 +149,501 @@ class TopicTagger(Processor):
                 processor_name=self.processor_name,
                 details={"topics": identified_topics, "topic_count": len(identified_topics)}
             )
-                
+
         except Exception as e:
+            if quote_task is not None and not quote_task.done():
+                quote_task.cancel()
             logger.error(f"❌ Error tagging topics for post {post.post_id}: {str(e)}")
             return ProcessingResult(
-                status=models.ProcessingStatus.ERROR, 
-                output=post, 
+                status=models.ProcessingStatus.ERROR,
+                output=post,
                 processor_name=self.processor_name,
                 reason=f"Error tagging topics: {str(e)}"
-            )
\ No newline at end of file
+            )
+
+    async def process_batch(
+        self, input_batch: list[models.Post]
+    ) -> list[ProcessingResult[models.Post]]:
+        """
+        Tag a batch of posts, amortizing LLM calls by classifying one topic
+        across many posts per call instead of one call per (post, topic).
+
+        Args:
+            input_batch: Posts to tag
+
+        Returns:
+            One processing result per post, in input order
+        """
+        if not input_batch:
+            return []
+
+        topic_prompts = await self._get_prompts()
+
+        # Start the quoted-post fetches up front so they overlap with the
+        # batched LLM calls
+        quote_tasks = {post.post_id: self._start_quote_fetch(post) for post in input_batch}
+
+        # Classify chunk by chunk so each batched prompt stays inside the
+        # model context
+        topics_by_post: dict[str, list[str]] = {}
+        for chunk in self._chunk_posts(input_batch):
+            topics_by_post.update(await self._classify_topics_for_posts(chunk, topic_prompts))
+
+        results = []
+        for post in input_batch:
+            try:
+                identified_topics = topics_by_post.get(post.post_id, [])
+
+                # Special handling for "nuance_sharing" topic
+                if await self._check_nuance_sharing(post, quote_tasks.get(post.post_id)):
+                    identified_topics.append("nuance_sharing")
+
+                post.topics = identified_topics
+
+                # We don't fail processing if no topics are found
+                logger.info(f"📋 Post {post.post_id} tagged with {len(identified_topics)} topics")
+                results.append(
+                    ProcessingResult(
+                        status=models.ProcessingStatus.ACCEPTED,
+                        output=post,
+                        processor_name=self.processor_name,
+                        details={"topics": identified_topics, "topic_count": len(identified_topics)}
+                    )
+                )
+            except Exception as e:
+                logger.error(f"❌ Error tagging topics for post {post.post_id}: {str(e)}")
+                results.append(
+                    ProcessingResult(
+                        status=models.ProcessingStatus.ERROR,
+                        output=post,
+                        processor_name=self.processor_name,
+                        reason=f"Error tagging topics: {str(e)}"
+                    )
+                )
+        return results
+
+    async def _get_prompts(self) -> dict[str, str]:
+        """
+        Get the topic prompts, reusing the last fetch for a short TTL so the
+        constitution store (and its own locking/IO) stays off the per-post
+        hot path.
+        """
+        if self._prompts_cache is not None and time.monotonic() < self._prompts_expiry:
+            return self._prompts_cache
+
+        self._prompts_cache = await constitution_store.get_topic_prompts()
+        self._topic_keywords = await constitution_store.get_topic_keywords()
+        self._compile_templates(self._prompts_cache)
+        self._prompts_expiry = time.monotonic() + _TOPIC_PROMPTS_TTL
+        return self._prompts_cache
+
+    def _compile_templates(self, topic_prompts: dict[str, str]) -> None:
+        """Pre-split each template around {tweet_text} when prompts (re)load."""
+        self._compiled = {}
+        for topic, template in topic_prompts.items():
+            split = _split_tweet_template(template)
+            self._compiled[topic] = split
+            if split is None:
+                logger.warning(
+                    f"⚠️ Topic {topic} prompt template cannot be pre-split (missing or "
+                    "duplicated {tweet_text}, or extra braces), falling back to str.format"
+                )
+            elif split[1].strip():
+                logger.warning(
+                    f"⚠️ Topic {topic} prompt template has text after {{tweet_text}}; "
+                    "move the tweet to the tail to enable server-side prefix caching"
+                )
+            else:
+                self._track_prefix_hash(topic, split[0])
+
+    @staticmethod
+    def _chunk_posts(posts: list[models.Post]) -> list[list[models.Post]]:
+        """Group posts so each batched prompt stays under the character budget."""
+        chunks = []
+        current_chunk: list[models.Post] = []
+        current_size = 0
+        for post in posts:
+            content_size = len(post.content or "")
+            if current_chunk and current_size + content_size > _BATCH_PROMPT_CHAR_BUDGET:
+                chunks.append(current_chunk)
+                current_chunk = []
+                current_size = 0
+            current_chunk.append(post)
+            current_size += content_size
+        if current_chunk:
+            chunks.append(current_chunk)
+        return chunks
+
+    async def _classify_topics_for_posts(
+        self, posts: list[models.Post], topic_prompts: dict[str, str]
+    ) -> dict[str, list[str]]:
+        """
+        Classify all topics for a chunk of posts with one LLM call per topic,
+        falling back to the single-post path for topics whose batched call fails.
+        """
+        topics_by_post: dict[str, list[str]] = {post.post_id: [] for post in posts}
+        if not topic_prompts:
+            return topics_by_post
+
+        # Skip topics whose keywords appear in none of the chunk's posts;
+        # the LLM still judges each post for the remaining topics
+        topics = [
+            topic
+            for topic in topic_prompts
+            if any(
+                self._topic_passes_prefilter(topic, (post.content or "").lower())
+                for post in posts
+            )
+        ]
+        tasks = [
+            asyncio.create_task(self._classify_topic_batch(topic, topic_prompts[topic], posts))
+            for topic in topics
+        ]
+        per_topic_results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        for topic, topic_result in zip(topics, per_topic_results):
+            if isinstance(topic_result, Exception):
+                logger.warning(
+                    f"⚠️ Batched classification of topic {topic} failed ({str(topic_result)}), falling back to per-post calls"
+                )
+                for post in posts:
+                    relevant_topics = await self._classify_topics(
+                        post.post_id, post.content, {topic: topic_prompts[topic]}
+                    )
+                    topics_by_post[post.post_id].extend(relevant_topics)
+                continue
+
+            for post, is_relevant in zip(posts, topic_result):
+                if is_relevant:
+                    logger.info(f"✅ Post {post.post_id} is about {topic}")
+                    topics_by_post[post.post_id].append(topic)
+                else:
+                    logger.debug(f"🚫 Post {post.post_id} is not about {topic}")
+
+        return topics_by_post
+
+    async def _classify_topic_batch(
+        self, topic: str, topic_prompt: str, posts: list[models.Post]
+    ) -> list[bool]:
+        """Classify one topic across many posts with a single LLM call."""
+        split = self._compiled.get(topic)
+        rubric = (split[0] + split[1]).strip() if split else topic_prompt.strip()
+
+        system_prompt = (
+            f"{rubric}\n\n"
+            "You will be given a numbered list of tweets. Apply the criterion above to each "
+            "tweet independently. Respond ONLY with a JSON array of booleans, one per tweet, in order."
+        )
+        tweet_list = "\n".join(f"{i + 1}) {post.content}" for i, post in enumerate(posts))
+
+        async with self._llm_semaphore:
+            llm_response = strip_thinking(
+                await query_llm(prompt=tweet_list, system_prompt=system_prompt, temperature=0.0)
+            )
+
+        results = self._parse_bool_array(llm_response)
+        if len(results) != len(posts):
+            raise ValueError(
+                f"Expected {len(posts)} booleans in LLM response, got {len(results)}"
+            )
+        return results
+
+    @staticmethod
+    def _parse_bool_array(llm_response: str) -> list[bool]:
+        """Parse the batched response, tolerating text around the JSON array."""
+        try:
+            results = json.loads(llm_response)
+        except json.JSONDecodeError:
+            match = _JSON_ARRAY_RE.search(llm_response)
+            if not match:
+                raise ValueError(f"No JSON array found in LLM response: {llm_response!r}")
+            results = json.loads(match.group(0))
+        return [_coerce_bool(result) for result in results]
+
+    def _start_quote_fetch(self, post: models.Post) -> asyncio.Task | None:
+        """
+        Start fetching the post's quoted tweet, if it has one, so the Twitter
+        API latency can be hidden behind the topic LLM calls.
+        """
+        try:
+            if post.platform_type != models.PlatformType.TWITTER:
+                return None
+            if not post.extra_data.get("is_quote_tweet", False):
+                return None
+            quoted_status_id = post.extra_data.get("quoted_status_id")
+            if not quoted_status_id:
+                return None
+
+            logger.debug(f"🔍 Post {post.post_id} is quote tweet, quoted_status_id: {quoted_status_id}")
+            return asyncio.create_task(self._twitter_discovery.get_post(quoted_status_id))
+        except Exception as e:
+            logger.warning(f"⚠️ Error checking nuance_sharing for post {post.post_id}: {str(e)}")
+            return None
+
+    async def _check_nuance_sharing(
+        self, post: models.Post, quote_task: asyncio.Task | None = None
+    ) -> bool:
+        """Check whether the post quote-tweets a post from the Nuance account."""
+        if quote_task is None:
+            quote_task = self._start_quote_fetch(post)
+        if quote_task is None:
+            return False
+
+        try:
+            # Await the (possibly prefetched) quoted post to check if it's
+            # from the Nuance account
+            quoted_post = await quote_task
+
+            if quoted_post.account_id == cst.NUANCE_SOCIAL_ACCOUNT_ID:
+                quoted_status_id = post.extra_data.get("quoted_status_id")
+                logger.info(f"✅ Post {post.post_id} tagged with 'nuance_sharing' - quotes Nuance account post {quoted_status_id}")
+                return True
+
+        except Exception as e:
+            logger.warning(f"⚠️ Error checking nuance_sharing for post {post.post_id}: {str(e)}")
+        return False
+
+    async def _classify_topics(
+        self, post_id: str, content: str, topic_prompts: dict[str, str]
+    ) -> list[str]:
+        """
+        Classify the content against all topics, batching the checks into a
+        single LLM call when enabled and falling back to per-topic calls.
+        """
+        if not topic_prompts:
+            return []
+
+        # Cheap lexical prefilter: topics with configured keywords are marked
+        # negative without an LLM call when no keyword appears in the content
+        content_lower = content.lower()
+        candidate_prompts = {}
+        for topic, topic_prompt in topic_prompts.items():
+            if self._topic_passes_prefilter(topic, content_lower):
+                candidate_prompts[topic] = topic_prompt
+            else:
+                logger.debug(f"🚫 Post {post_id} is not about {topic} (keyword prefilter)")
+        topic_prompts = candidate_prompts
+
+        if not topic_prompts:
+            return []
+
+        # First tier: let the local classifier decide the topics it is
+        # confident about, escalating only the uncertain ones to the LLM
+        local_topics, topic_prompts = await self._classify_topics_locally(
+            post_id, content, topic_prompts
+        )
+
+        if not topic_prompts:
+            return local_topics
+
+        if settings.LLM_BATCH_TOPIC_TAGGING:
+            try:
+                return local_topics + await self._classify_topics_batched(
+                    post_id, content, topic_prompts
+                )
+            except Exception as e:
+                logger.warning(
+                    f"⚠️ Batched topic classification failed for post {post_id} ({str(e)}), falling back to per-topic calls"
+                )
+
+        return local_topics + await self._classify_topics_individually(
+            post_id, content, topic_prompts
+        )
+
+    async def _classify_topics_locally(
+        self, post_id: str, content: str, topic_prompts: dict[str, str]
+    ) -> tuple[list[str], dict[str, str]]:
+        """
+        Run the local classifier tier, if configured. Returns the topics it
+        identified with high confidence and the prompts for topics that must
+        escalate to the remote LLM (everything, when no local classifier).
+        """
+        if self._local_classifier is None:
+            return [], topic_prompts
+
+        local_topics = []
+        escalation_prompts = {}
+        for topic, topic_prompt in topic_prompts.items():
+            split = self._compiled.get(topic)
+            rubric = (split[0] + split[1]).strip() if split else topic_prompt.strip()
+            try:
+                is_relevant, confidence = await self._local_classifier.predict(content, rubric)
+            except Exception as e:
+                logger.warning(f"⚠️ Local classifier failed for topic {topic}: {str(e)}")
+                escalation_prompts[topic] = topic_prompt
+                continue
+
+            if confidence < self._local_classifier.confidence_threshold:
+                escalation_prompts[topic] = topic_prompt
+            elif is_relevant:
+                logger.info(f"✅ Post {post_id} is about {topic} (local, confidence: {confidence:.2f})")
+                local_topics.append(topic)
+            else:
+                logger.debug(f"🚫 Post {post_id} is not about {topic} (local, confidence: {confidence:.2f})")
+
+        # Escalation rate is the knob for tuning the confidence threshold
+        logger.info(
+            f"📊 Local classifier decided {len(topic_prompts) - len(escalation_prompts)}/{len(topic_prompts)} "
+            f"topics for post {post_id}, {len(escalation_prompts)} escalated to LLM"
+        )
+        return local_topics, escalation_prompts
+
+    async def _classify_topics_batched(
+        self, post_id: str, content: str, topic_prompts: dict[str, str]
+    ) -> list[str]:
+        """
+        Check all topics with one composite LLM call that returns a JSON
+        object mapping topic names to booleans.
+        """
+        splits = {topic: self._compiled.get(topic) for topic in topic_prompts}
+
+        if all(split is not None and not split[1].strip() for split in splits.values()):
+            # All templates end with the tweet, so the whole rubric can go in
+            # a static system message with only the tweet in the user message,
+            # letting the backend reuse the prefill across posts.
+            sections = []
+            for topic, split in splits.items():
+                sections.append(f"### Topic: {topic}\n{split[0].rstrip()}")
+
+            system_prompt = (
+                "Evaluate each of the following topic checks independently against the tweet.\n\n"
+                + "\n\n".join(sections)
+                + "\n\nRespond ONLY with a JSON object mapping each topic name to true or false."
+            )
+            async with self._llm_semaphore:
+                llm_response = strip_thinking(
+                    await query_llm(
+                        prompt=f"Tweet:\n{content}",
+                        system_prompt=system_prompt,
+                        temperature=0.0,
+                    )
+                )
+        else:
+            sections = []
+            for topic, topic_prompt in topic_prompts.items():
+                split = splits[topic]
+                formatted = (
+                    split[0] + content + split[1]
+                    if split is not None
+                    else topic_prompt.format(tweet_text=content)
+                )
+                sections.append(f"### Topic: {topic}\n{formatted}")
+
+            combined_prompt = (
+                "Evaluate each of the following topic checks independently.\n\n"
+                + "\n\n".join(sections)
+                + "\n\nRespond ONLY with a JSON object mapping each topic name to true or false."
+            )
+            async with self._llm_semaphore:
+                llm_response = strip_thinking(
+                    await query_llm(prompt=combined_prompt, temperature=0.0)
+                )
+        topic_results = self._parse_topic_json(llm_response)
+
+        # A topic the model dropped from its JSON must raise so the caller
+        # falls back to per-topic calls instead of silently going negative
+        missing_topics = [topic for topic in topic_prompts if topic not in topic_results]
+        if missing_topics:
+            raise ValueError(f"LLM response is missing topics: {missing_topics}")
+
+        identified_topics = []
+        for topic in topic_prompts:
+            if topic_results[topic]:
+                logger.info(f"✅ Post {post_id} is about {topic}")
+                identified_topics.append(topic)
+            else:
+                logger.debug(f"🚫 Post {post_id} is not about {topic}")
+        return identified_topics
+
+    async def _classify_topics_individually(
+        self, post_id: str, content: str, topic_prompts: dict[str, str]
+    ) -> list[str]:
+        """Check each topic with its own LLM call, fanned out concurrently."""
+
+        async def check_topic(topic: str, topic_prompt: str) -> str:
+            split = self._compiled.get(topic)
+            if split is not None and not split[1].strip():
+                # Template ends with the tweet: send the static rubric as a
+                # system message so backends can prefix-cache it across posts
+                async with self._llm_semaphore:
+                    llm_response = await query_llm(
+                        prompt=content,
+                        system_prompt=split[0],
+                        temperature=0.0,
+                        max_tokens=2,
+                        stop=["\n", ".", "</s>"],
+                    )
+            else:
+                # Use the topic-specific prompt template
+                prompt_about = (
+                    split[0] + content + split[1]
+                    if split is not None
+                    else topic_prompt.format(tweet_text=content)
+                )
+                async with self._llm_semaphore:
+                    llm_response = await query_llm(
+                        prompt=prompt_about,
+                        temperature=0.0,
+                        max_tokens=2,
+                        stop=["\n", ".", "</s>"],
+                    )
+
+            # Capped responses are a couple of tokens, so skip the regex work
+            if len(llm_response) < 32 and "<think>" not in llm_response:
+                return llm_response
+            return strip_thinking(llm_response)
+
+        # Evaluate all topics concurrently
+        topics = list(topic_prompts.keys())
+        tasks = [
+            asyncio.create_task(check_topic(topic, topic_prompt))
+            for topic, topic_prompt in topic_prompts.items()
+        ]
+        llm_responses = await asyncio.gather(*tasks, return_exceptions=True)
+
+        identified_topics = []
+        for topic, llm_response in zip(topics, llm_responses):
+            if isinstance(llm_response, Exception):
+                logger.warning(f"⚠️ Error checking topic {topic} for post {post_id}: {str(llm_response)}")
+                continue
+
+            # Check if the post is related to this topic
+            is_relevant = _parse_bool_response(llm_response)
+
+            if is_relevant:
+                logger.info(f"✅ Post {post_id} is about {topic}")
+                identified_topics.append(topic)
+            else:
+                logger.debug(f"🚫 Post {post_id} is not about {topic}")
+        return identified_topics
+
+    def _topic_passes_prefilter(self, topic: str, content_lower: str) -> bool:
+        """
+        Topics with configured keywords require at least one keyword in the
+        content; keyword-less topics always go to the LLM.
+        """
+        keywords = self._topic_keywords.get(topic)
+        if not keywords:
+            return True
+        return any(keyword in content_lower for keyword in keywords)
+
+    def _track_prefix_hash(self, topic: str, prefix: str) -> None:
+        """Log when a topic's static prompt prefix is first seen or changes."""
+        prefix_hash = hashlib.sha256(prefix.encode()).hexdigest()[:16]
+        if self._static_prefix_hashes.get(topic) != prefix_hash:
+            logger.info(f"🔍 Static prompt prefix for topic {topic}: {prefix_hash}")
+            self._static_prefix_hashes[topic] = prefix_hash
+
+    @staticmethod
+    def _parse_topic_json(llm_response: str) -> dict[str, bool]:
+        """Parse the batched response, tolerating text around the JSON object."""
+        try:
+            topic_results = json.loads(llm_response)
+        except json.JSONDecodeError:
+            match = _JSON_OBJECT_RE.search(llm_response)
+            if not match:
+                raise ValueError(f"No JSON object found in LLM response: {llm_response!r}")
+            topic_results = json.loads(match.group(0))
+        # Normalize tolerantly; un-coercible values raise so the caller falls
+        # back to per-topic calls instead of silently marking topics negative
+        return {topic: _coerce_bool(value) for topic, value in topic_results.items()}
\ No newline at end of file
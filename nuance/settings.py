@@ -37,6 +37,63 @@ class Settings(BaseSettings):
     WALLET_NAME: str = Field(default="default", description="Name of the Bittensor wallet.")
     WALLET_HOTKEY: str = Field(default="default", description="Hotkey of the Bittensor wallet.")
 
+    # LLM settings
+    LLM_BATCH_TOPIC_TAGGING: bool = Field(
+        default=True,
+        description="Classify all topics for a post in one batched LLM call instead of one call per topic.",
+    )
+    LLM_MAX_CONCURRENT_REQUESTS: int = Field(
+        default=10,
+        description="Maximum number of concurrent LLM calls issued by a single processor.",
+    )
+    LLM_HTTP_MAX_CONNECTIONS: int = Field(
+        default=200,
+        description="Maximum number of connections in the LLM HTTP client pool.",
+    )
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = Field(
+        default=100,
+        description="Maximum number of keep-alive connections in the LLM HTTP client pool.",
+    )
+    LLM_CACHE_ENABLED: bool = Field(
+        default=True,
+        description="Cache responses of deterministic (temperature=0.0) LLM calls in memory.",
+    )
+    LLM_CACHE_MAX_SIZE: int = Field(
+        default=1024,
+        description="Maximum number of entries in the LLM response cache.",
+    )
+    LLM_CACHE_TTL: int = Field(
+        default=3600,
+        description="Time-to-live in seconds for entries in the LLM response cache.",
+    )
+    LLM_SEMANTIC_CACHE_ENABLED: bool = Field(
+        default=False,
+        description="Serve LLM responses for near-duplicate prompts from an embedding-similarity cache. "
+                "Requires the optional `semantic-cache` dependencies.",
+    )
+    LLM_SEMANTIC_CACHE_MODEL: str = Field(
+        default="sentence-transformers/all-MiniLM-L6-v2",
+        description="Local embedding model used by the semantic LLM cache.",
+    )
+    LLM_SEMANTIC_CACHE_THRESHOLD: float = Field(
+        default=0.92,
+        description="Minimum cosine similarity for a semantic LLM cache hit.",
+    )
+    LLM_SEMANTIC_CACHE_TTL: int = Field(
+        default=3600,
+        description="Time-to-live in seconds for entries in the semantic LLM cache.",
+    )
+    LOCAL_TOPIC_CLASSIFIER_MODEL_PATH: str = Field(
+        default="",
+        description="Directory with a quantized ONNX topic classifier and its tokenizer. "
+                "Empty disables the local tier and every topic check goes to the remote LLM. "
+                "Requires the optional `local-classifier` dependencies.",
+    )
+    LOCAL_TOPIC_CLASSIFIER_CONFIDENCE_THRESHOLD: float = Field(
+        default=0.85,
+        description="Minimum local classifier confidence to skip escalating a topic check to the remote LLM.",
+    )
+
     # API Keys and Secrets
     DATURA_API_KEY: str = Field(description="Datura API key.")
     CHUTES_API_KEY: str = Field(description="Chutes API key.")
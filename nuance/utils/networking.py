@@ -2,6 +2,8 @@
 import asyncio
 
 import aiohttp
+import httpx
+import orjson
 from loguru import logger
 
 MAX_RETRIES = 5
@@ -26,6 +28,31 @@ async def async_http_request_with_retry(
                 if "application/json" in content_type:
                     return await response.json()
                 return await response.text()
+        except Exception as e:
+            logger.warning(f"⚠️  Attempt {attempt + 1} for {url} failed: {e}")
+            if attempt < MAX_RETRIES - 1:
+                await asyncio.sleep(RETRY_DELAY * (attempt + 1))
+            else:
+                logger.error(f"❌ All {MAX_RETRIES} attempts failed for {url}")
+                raise
+
+
+async def async_httpx_request_with_retry(
+    client: httpx.AsyncClient, method: str, url: str, **kwargs
+):
+    """
+    Make an HTTP request with retry logic using a shared httpx client.
+    Returns JSON if response is application/json, otherwise returns text.
+    """
+    for attempt in range(MAX_RETRIES):
+        try:
+            response = await client.request(method, url, **kwargs)
+            response.raise_for_status()
+            content_type = response.headers.get("Content-Type", "").lower()
+            if "application/json" in content_type:
+                # orjson parses the raw bytes directly, faster than stdlib json
+                return orjson.loads(response.content)
+            return response.text
         except Exception as e:
             logger.warning(f"⚠️  Attempt {attempt + 1} for {url} failed: {e}")
             if attempt < MAX_RETRIES - 1:
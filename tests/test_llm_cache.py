@@ -0,0 +1,39 @@
+import asyncio
+
+from nuance.processing.llm_cache import AsyncTTLCache, make_cache_key
+
+
+async def test_cache_hit_and_eviction():
+    cache = AsyncTTLCache(max_size=2, ttl=60)
+
+    key_a = make_cache_key("model", "prompt a", 1024, 0.0, 0.5)
+    key_b = make_cache_key("model", "prompt b", 1024, 0.0, 0.5)
+    key_c = make_cache_key("model", "prompt c", 1024, 0.0, 0.5)
+
+    await cache.set(key_a, "response a")
+    await cache.set(key_b, "response b")
+    assert await cache.get(key_a) == "response a"
+
+    # Inserting a third entry evicts the least recently used (key_b)
+    await cache.set(key_c, "response c")
+    assert await cache.get(key_b) is None
+    assert await cache.get(key_a) == "response a"
+    assert await cache.get(key_c) == "response c"
+
+    print("Cache hit and eviction OK")
+
+
+async def test_cache_ttl_expiry():
+    cache = AsyncTTLCache(max_size=10, ttl=0)
+
+    key = make_cache_key("model", "prompt", 1024, 0.0, 0.5)
+    await cache.set(key, "response")
+    await asyncio.sleep(0.01)
+    assert await cache.get(key) is None
+
+    print("Cache TTL expiry OK")
+
+
+if __name__ == "__main__":
+    asyncio.run(test_cache_hit_and_eviction())
+    asyncio.run(test_cache_ttl_expiry())